@@ -1,13 +1,13 @@
 import sys
 from PySide6.QtWidgets import (
     QApplication, QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QTextEdit, QLabel,
-    QFileDialog, QComboBox, QMessageBox, QFrame
+    QFileDialog, QComboBox, QMessageBox, QFrame, QCheckBox
 )
 from PySide6.QtGui import QFont, QColor
 from PySide6.QtCore import Qt
 import os
-from interpreter import run_compiler
-from transpiler_backend import transpile_to_python, transpile_to_cpp, transpile_to_c, transpile_to_java
+from interpreter import CompilerSession
+from transpiler_backend import transpile
 
 
 class TranspilerGUI(QWidget):
@@ -48,8 +48,14 @@ class TranspilerGUI(QWidget):
                 border: 2px solid #4CAF50;
             }
         """)
+        self.optimize_checkbox = QCheckBox("Optimized output")
+        self.optimize_checkbox.setStyleSheet("color: #E0E0E0; font-size: 14px;")
+        self.trace_memory_checkbox = QCheckBox("Trace memory (slower)")
+        self.trace_memory_checkbox.setStyleSheet("color: #E0E0E0; font-size: 14px;")
         lang_layout.addWidget(lang_label)
         lang_layout.addWidget(self.language_selector)
+        lang_layout.addWidget(self.optimize_checkbox)
+        lang_layout.addWidget(self.trace_memory_checkbox)
         lang_layout.addStretch()
         main_layout.addLayout(lang_layout)
 
@@ -123,8 +129,20 @@ class TranspilerGUI(QWidget):
 
         editor_layout.addLayout(output_layout)
         main_layout.addLayout(editor_layout)
+
+        self.status_bar = QLabel("Ready")
+        self.status_bar.setStyleSheet("""
+            color: #A0A0A0;
+            background-color: #1B1B1B;
+            border-radius: 6px;
+            padding: 6px 12px;
+            font-size: 12px;
+        """)
+        main_layout.addWidget(self.status_bar)
         self.setLayout(main_layout)
 
+        self.session = CompilerSession()
+
     def set_elegant_theme(self):
         self.setStyleSheet("""
             QWidget {
@@ -175,16 +193,16 @@ class TranspilerGUI(QWidget):
     def compile_and_run(self):
         code = self.input_editor.toPlainText()
         try:
-            import io
-            import contextlib
-
-            buffer = io.StringIO()
-            with contextlib.redirect_stdout(buffer):
-                run_compiler(code)
-            self.compiled_output.setPlainText(buffer.getvalue())
+            result = self.session.run(code, trace_memory=self.trace_memory_checkbox.isChecked())
+            self.compiled_output.setPlainText('\n'.join(self.session.output))
+            status = result.summary()
+            if self.session.resumed_from:
+                status += f" | resumed at statement {self.session.resumed_from + 1}"
+            self.status_bar.setText(status)
 
         except Exception as e:
             self.compiled_output.setPlainText(f"Interpreter error: {e}")
+            self.status_bar.setText("Run failed")
 
     def clear_input(self):
         self.input_editor.clear()
@@ -213,19 +231,23 @@ class TranspilerGUI(QWidget):
             QMessageBox.warning(self, "Language Not Selected", "Please select a language.")
             return
 
+        optimize = self.optimize_checkbox.isChecked()
+        trace_memory = self.trace_memory_checkbox.isChecked()
         try:
             if selected_lang == "Python":
-                transpiled = transpile_to_python(source_code)
+                result = transpile('python', source_code, trace_memory=trace_memory, optimize=optimize)
             elif selected_lang == "C++":
-                transpiled = transpile_to_cpp(source_code)
+                result = transpile('cpp', source_code, trace_memory=trace_memory, optimize=optimize)
             elif selected_lang == "C":
-                transpiled = transpile_to_c(source_code)
+                result = transpile('c', source_code, trace_memory=trace_memory, optimize=optimize)
             elif selected_lang == "Java":
-                transpiled = transpile_to_java(source_code)
+                result = transpile('java', source_code, trace_memory=trace_memory, optimize=optimize)
             else:
-                transpiled = "// Transpilation not supported for this language."
+                self.output_editor.setPlainText("// Transpilation not supported for this language.")
+                return
 
-            self.output_editor.setPlainText(transpiled)
+            self.output_editor.setPlainText(result.code)
+            self.status_bar.setText(result.summary())
         except Exception as e:
             QMessageBox.critical(self, "Transpilation Error", str(e))
 
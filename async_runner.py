@@ -0,0 +1,70 @@
+import asyncio
+
+from compiler import Lexer, Parser, Interpreter
+
+YIELD_EVERY = 1000
+PAUSE = object()
+
+
+class AsyncInterpreter(Interpreter):
+    """Runs a program as a generator so many programs can share one event loop.
+
+    Every yield_every statements (loop iterations count through their body
+    statements) control goes back to the event loop. Printed values are
+    streamed through stream() instead of being written to stdout, and each
+    instance keeps its own env.
+    """
+
+    def __init__(self, statements, yield_every=YIELD_EVERY):
+        super().__init__(statements)
+        self.yield_every = yield_every
+        self.steps = 0
+
+    def run_statements(self, statements):
+        for stmt in statements:
+            self.steps += 1
+            if self.steps >= self.yield_every:
+                self.steps = 0
+                yield PAUSE
+
+            if stmt[0] == 'ASSIGN':
+                _, name, expr = stmt
+                self.env[name] = self.eval_expr(expr)
+            elif stmt[0] == 'PRINT':
+                _, expr = stmt
+                yield self.eval_expr(expr)
+            elif stmt[0] == 'IF':
+                _, cond, true_branch, false_branch = stmt
+                if self.eval_expr(cond):
+                    yield from self.run_statements(true_branch)
+                else:
+                    yield from self.run_statements(false_branch)
+            elif stmt[0] == 'WHILE':
+                _, cond, body = stmt
+                while self.eval_expr(cond):
+                    yield from self.run_statements(body)
+            elif stmt[0] == 'FOR':
+                _, var, start_expr, end_expr, body = stmt
+                start = self.eval_expr(start_expr)
+                end = self.eval_expr(end_expr)
+                for i in range(start, end + 1):
+                    self.env[var] = i
+                    yield from self.run_statements(body)
+
+    async def stream(self):
+        for item in self.run_statements(self.statements):
+            if item is PAUSE:
+                await asyncio.sleep(0)
+            else:
+                yield item
+
+    async def exec_async(self):
+        return [value async for value in self.stream()]
+
+
+async def run_compiler_async(source_code, yield_every=YIELD_EVERY):
+    """Async counterpart of run_compiler: yields each printed value as it is produced."""
+    tokens = Lexer(source_code).tokenize_compact()
+    ast = Parser(tokens).parse()
+    async for value in AsyncInterpreter(ast, yield_every).stream():
+        yield value
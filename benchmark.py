@@ -0,0 +1,243 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+from compiler import Lexer, Parser, Interpreter
+from transpiler_backend import transpile_to_python, transpile_to_c, transpile_to_cpp, transpile_to_java
+
+DEFAULT_CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmarks')
+TIMEOUT = 60
+
+
+class BackendResult:
+    def __init__(self, backend, status, runtime=None, compile_time=None, output=None, detail=None):
+        self.backend = backend
+        self.status = status
+        self.runtime = runtime
+        self.compile_time = compile_time
+        self.output = output
+        self.detail = detail
+
+    def to_dict(self):
+        return {
+            'backend': self.backend,
+            'status': self.status,
+            'runtime': self.runtime,
+            'compile_time': self.compile_time,
+            'detail': self.detail,
+        }
+
+
+def run_interpreter(source_code, workdir):
+    buffer = io.StringIO()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(buffer):
+        ast = Parser(Lexer(source_code).tokenize_compact()).parse()
+        Interpreter(ast).exec()
+    return BackendResult('interpreter', 'ok', time.perf_counter() - start, output=buffer.getvalue())
+
+
+def run_command(backend, command, compile_time=None):
+    # An inherited PYTHONUNBUFFERED would make the Python backends pay for a
+    # write syscall per print, which says nothing about the generated code.
+    env = {name: value for name, value in os.environ.items() if name != 'PYTHONUNBUFFERED'}
+    start = time.perf_counter()
+    try:
+        proc = subprocess.run(command, capture_output=True, text=True, timeout=TIMEOUT, env=env)
+    except subprocess.TimeoutExpired:
+        return BackendResult(backend, 'error', compile_time=compile_time, detail=f"timed out after {TIMEOUT}s")
+    runtime = time.perf_counter() - start
+    if proc.returncode != 0:
+        return BackendResult(backend, 'error', runtime, compile_time, proc.stdout, proc.stderr.strip()[-500:])
+    return BackendResult(backend, 'ok', runtime, compile_time, proc.stdout)
+
+
+def compile_command(backend, command):
+    start = time.perf_counter()
+    try:
+        proc = subprocess.run(command, capture_output=True, text=True, timeout=TIMEOUT)
+    except subprocess.TimeoutExpired:
+        return None, BackendResult(backend, 'error', detail="compiler timed out")
+    compile_time = time.perf_counter() - start
+    if proc.returncode != 0:
+        return None, BackendResult(backend, 'error', compile_time=compile_time, detail=proc.stderr.strip()[-500:])
+    return compile_time, None
+
+
+def python_backend(name, transpiler):
+    def run(source_code, workdir):
+        path = os.path.join(workdir, f'{name}.py')
+        with open(path, 'w', encoding='utf-8') as file:
+            file.write(transpiler(source_code))
+        return run_command(name, [sys.executable, path])
+    return run
+
+
+def native_backend(name, compiler, transpiler, extension, flags):
+    def run(source_code, workdir):
+        executable = shutil.which(compiler)
+        if executable is None:
+            return BackendResult(name, 'skipped', detail=f"{compiler} not installed")
+        source_path = os.path.join(workdir, f'{name}.{extension}')
+        binary_path = os.path.join(workdir, name)
+        with open(source_path, 'w', encoding='utf-8') as file:
+            file.write(transpiler(source_code))
+        compile_time, failure = compile_command(name, [executable, *flags, '-o', binary_path, source_path])
+        if failure:
+            return failure
+        return run_command(name, [binary_path], compile_time)
+    return run
+
+
+def java_backend(name, transpiler):
+    def run(source_code, workdir):
+        javac, java = shutil.which('javac'), shutil.which('java')
+        if javac is None or java is None:
+            return BackendResult(name, 'skipped', detail="javac/java not installed")
+        class_dir = os.path.join(workdir, name)
+        os.makedirs(class_dir, exist_ok=True)
+        source_path = os.path.join(class_dir, 'Main.java')
+        with open(source_path, 'w', encoding='utf-8') as file:
+            file.write(transpiler(source_code))
+        compile_time, failure = compile_command(name, [javac, '-d', class_dir, source_path])
+        if failure:
+            return failure
+        return run_command(name, [java, '-cp', class_dir, 'Main'], compile_time)
+    return run
+
+
+BACKENDS = {
+    'interpreter': run_interpreter,
+    'python': python_backend('python', transpile_to_python),
+    'python-opt': python_backend('python-opt', lambda code: transpile_to_python(code, optimize=True)),
+    'c': native_backend('c', 'gcc', transpile_to_c, 'c', ['-O2']),
+    'c-opt': native_backend('c-opt', 'gcc', lambda code: transpile_to_c(code, optimize=True), 'c', ['-O2']),
+    'cpp': native_backend('cpp', 'g++', transpile_to_cpp, 'cpp', ['-O2']),
+    'cpp-opt': native_backend('cpp-opt', 'g++', lambda code: transpile_to_cpp(code, optimize=True), 'cpp', ['-O2']),
+    'java': java_backend('java', transpile_to_java),
+    'java-opt': java_backend('java-opt', lambda code: transpile_to_java(code, optimize=True)),
+}
+
+
+def normalize(output):
+    return output.replace('\r\n', '\n').rstrip('\n')
+
+
+def first_difference(expected, actual):
+    expected_lines = normalize(expected).split('\n')
+    actual_lines = normalize(actual).split('\n')
+    for number, (want, got) in enumerate(zip(expected_lines, actual_lines), 1):
+        if want != got:
+            return f"line {number}: expected {want!r}, got {got!r}"
+    return f"expected {len(expected_lines)} lines, got {len(actual_lines)}"
+
+
+def run_program(path, backends, repeat=1):
+    """Run one DSL program on every backend and compare each stdout with the interpreter's."""
+    with open(path, 'r', encoding='utf-8') as file:
+        source_code = file.read()
+
+    results = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for backend in backends:
+            best = None
+            for _ in range(repeat):
+                try:
+                    result = BACKENDS[backend](source_code, workdir)
+                except Exception as e:
+                    result = BackendResult(backend, 'error', detail=f"{type(e).__name__}: {e}")
+                if result.status != 'ok':
+                    best = result
+                    break
+                if best is None or result.runtime < best.runtime:
+                    best = result
+            results.append(best)
+
+    reference = next((r for r in results if r.backend == 'interpreter' and r.status == 'ok'), None)
+    if reference is not None:
+        for result in results:
+            if result.status == 'ok' and result is not reference:
+                if normalize(result.output) != normalize(reference.output):
+                    result.status = 'mismatch'
+                    result.detail = first_difference(reference.output, result.output)
+
+    return {
+        'program': os.path.basename(path),
+        'results': results,
+    }
+
+
+def failures(entry):
+    """Count backends that disagree with the interpreter, including ones that crash or fail to compile."""
+    reference_ok = any(r.backend == 'interpreter' and r.status == 'ok' for r in entry['results'])
+    return sum(
+        result.status == 'mismatch' or (reference_ok and result.status == 'error')
+        for result in entry['results']
+    )
+
+
+def collect_programs(paths):
+    programs = []
+    for path in paths:
+        if os.path.isdir(path):
+            programs.extend(os.path.join(path, name) for name in sorted(os.listdir(path)) if name.endswith('.txt'))
+        else:
+            programs.append(path)
+    return programs
+
+
+def format_table(report, backends):
+    header = ['program'] + backends
+    rows = [header]
+    for entry in report:
+        row = [entry['program']]
+        for result in entry['results']:
+            if result.status == 'ok':
+                row.append(f"{result.runtime * 1000:.1f} ms")
+            elif result.status == 'mismatch':
+                row.append(f"MISMATCH {result.runtime * 1000:.1f} ms")
+            else:
+                row.append(result.status)
+        rows.append(row)
+
+    widths = [max(len(row[i]) for row in rows) for i in range(len(header))]
+    lines = ['  '.join(cell.ljust(width) for cell, width in zip(row, widths)) for row in rows]
+    lines.insert(1, '  '.join('-' * width for width in widths))
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description="Run DSL programs on every backend and compare their output.")
+    arg_parser.add_argument('paths', nargs='*', default=[DEFAULT_CORPUS], help="program files or directories of .txt programs")
+    arg_parser.add_argument('--backends', default=','.join(BACKENDS), help="comma separated subset of: " + ', '.join(BACKENDS))
+    arg_parser.add_argument('--repeat', type=int, default=1, help="runs per backend; the fastest is reported")
+    arg_parser.add_argument('--json', dest='json_path', help="write the full report to this file")
+    args = arg_parser.parse_args(argv)
+
+    backends = [name.strip() for name in args.backends.split(',') if name.strip()]
+    unknown = [name for name in backends if name not in BACKENDS]
+    if unknown:
+        arg_parser.error(f"unknown backends: {', '.join(unknown)}")
+
+    report = [run_program(path, backends, args.repeat) for path in collect_programs(args.paths)]
+    print(format_table(report, backends))
+
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as file:
+            json.dump([
+                {'program': entry['program'], 'results': [result.to_dict() for result in entry['results']]}
+                for entry in report
+            ], file, indent=2)
+
+    return 1 if sum(failures(entry) for entry in report) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,146 +1,258 @@
+from array import array
+import re
+
+TOKEN_KINDS = (
+    'EOF', 'EOL', 'INDENT', 'DEDENT', 'NUMBER', 'IDENTIFIER',
+    'LET', 'PRINT', 'IF', 'ELSE', 'WHILE', 'FOR', 'TO',
+    '=', '+', '-', '*', '/', '%', '>', '<',
+)
+(EOF, EOL, INDENT, DEDENT, NUMBER, IDENTIFIER,
+ LET, PRINT, IF, ELSE, WHILE, FOR, TO,
+ EQUALS, PLUS, MINUS, STAR, SLASH, PERCENT, GREATER, LESS) = range(len(TOKEN_KINDS))
+KIND_CODES = {name: code for code, name in enumerate(TOKEN_KINDS)}
+
+WORD_KINDS = {word: KIND_CODES[word.upper()] for word in ('let', 'print', 'if', 'else', 'while', 'for', 'to',
+                                                         '=', '+', '-', '*', '/', '%', '>', '<')}
+WORD_PATTERN = re.compile(r'[=+\-*/%><]|[^\s=+\-*/%><]+')
+
+
+class TokenStream:
+    """Compact token sequence: one byte per kind plus parallel value and offset arrays.
+
+    NUMBER and IDENTIFIER values are indices into the interned numbers/names
+    tables; offsets are character positions in the original source.
+    """
+
+    def __init__(self):
+        self.kinds = array('B')
+        self.values = array('I')
+        self.offsets = array('I')
+        self.names = []
+        self.numbers = []
+        self.name_index = {}
+        self.number_index = {}
+
+    def intern_name(self, name):
+        index = self.name_index.get(name)
+        if index is None:
+            index = self.name_index[name] = len(self.names)
+            self.names.append(name)
+        return index
+
+    def intern_number(self, number):
+        index = self.number_index.get(number)
+        if index is None:
+            index = self.number_index[number] = len(self.numbers)
+            self.numbers.append(number)
+        return index
+
+    def append(self, kind, value=None, offset=0):
+        index = 0
+        if kind == IDENTIFIER:
+            index = self.intern_name(value)
+        elif kind == NUMBER:
+            index = self.intern_number(value)
+        self.kinds.append(kind)
+        self.values.append(index)
+        self.offsets.append(offset)
+
+    def value(self, i):
+        kind = self.kinds[i]
+        if kind == IDENTIFIER:
+            return self.names[self.values[i]]
+        if kind == NUMBER:
+            return self.numbers[self.values[i]]
+        if kind >= LET:
+            return TOKEN_KINDS[kind].lower()
+        return None
+
+    def __len__(self):
+        return len(self.kinds)
+
+    def __getitem__(self, i):
+        return (TOKEN_KINDS[self.kinds[i]], self.value(i))
+
+    def __iter__(self):
+        for i in range(len(self.kinds)):
+            yield self[i]
+
+    @classmethod
+    def from_tokens(cls, tokens):
+        stream = cls()
+        for kind, value in tokens:
+            stream.append(KIND_CODES[kind], value)
+        return stream
+
+
 class Lexer:
     def __init__(self, source_code):
         self.code = source_code
         self.tokens = []
 
     def tokenize(self):
-        lines = self.code.strip().splitlines()
+        self.tokens = list(self.tokenize_compact())
+        return self.tokens
+
+    def tokenize_compact(self):
+        stream = TokenStream()
+        add_kind, add_value, add_offset = stream.kinds.append, stream.values.append, stream.offsets.append
+        word_kinds = WORD_KINDS
+        find_words = WORD_PATTERN.finditer
+        text = self.code.strip()
+        position = len(self.code) - len(self.code.lstrip())
         indent_stack = [0]
 
-        for line in lines:
+        for raw_line in text.splitlines(True):
+            line_start = position
+            position += len(raw_line)
+            line = raw_line.splitlines()[0]
             if not line.strip():
                 continue
 
             stripped = line.lstrip()
             indent = len(line) - len(stripped)
+            line_offset = line_start + indent
 
             if indent > indent_stack[-1]:
-                self.tokens.append(('INDENT', None))
+                stream.append(INDENT, offset=line_offset)
                 indent_stack.append(indent)
             while indent < indent_stack[-1]:
-                self.tokens.append(('DEDENT', None))
+                stream.append(DEDENT, offset=line_offset)
                 indent_stack.pop()
 
-            for op in ['=', '+', '-', '*', '/', '%', '>', '<']:
-                stripped = stripped.replace(op, f' {op} ')
-
-            words = stripped.strip().split()
-            for word in words:
-                if word.isdigit():
-                    self.tokens.append(('NUMBER', int(word)))
-                elif word in ('let', 'print', 'if', 'else', 'while', 'for', 'to'):
-                    self.tokens.append((word.upper(), word))
-                elif word in ('=', '+', '-', '*', '/', '%', '>', '<'):
-                    self.tokens.append((word, word))
-                elif word.isidentifier():
-                    self.tokens.append(('IDENTIFIER', word))
-                else:
-                    raise SyntaxError(f"Unknown token: {word}")
-            self.tokens.append(('EOL', None))
+            for match in find_words(stripped):
+                word = match.group()
+                kind = word_kinds.get(word)
+                index = 0
+                if kind is None:
+                    if word.isdigit():
+                        kind = NUMBER
+                        index = stream.intern_number(int(word))
+                    elif word.isidentifier():
+                        kind = IDENTIFIER
+                        index = stream.intern_name(word)
+                    else:
+                        raise SyntaxError(f"Unknown token: {word}")
+                add_kind(kind)
+                add_value(index)
+                add_offset(line_offset + match.start())
+            stream.append(EOL, offset=line_start + len(line))
 
         while len(indent_stack) > 1:
-            self.tokens.append(('DEDENT', None))
+            stream.append(DEDENT, offset=position)
             indent_stack.pop()
 
-        self.tokens.append(('EOF', None))
-        return self.tokens
+        stream.append(EOF, offset=position)
+        return stream
 
 class Parser:
     def __init__(self, tokens):
+        if not isinstance(tokens, TokenStream):
+            tokens = TokenStream.from_tokens(tokens)
         self.tokens = tokens
+        self.kinds = tokens.kinds
+        self.values = tokens.values
+        self.names = tokens.names
+        self.numbers = tokens.numbers
+        self.length = len(tokens.kinds)
         self.current = 0
 
     def peek(self):
-        if self.current < len(self.tokens):
-            return self.tokens[self.current]
-        return ('EOF', None)
+        if self.current < self.length:
+            return self.kinds[self.current]
+        return EOF
 
-    def consume(self, expected_type=None):
-        if self.current >= len(self.tokens):
+    def consume(self, expected_kind=None):
+        if self.current >= self.length:
             raise SyntaxError("Unexpected end of input")
-        token = self.tokens[self.current]
-        if expected_type and token[0] != expected_type:
-            raise SyntaxError(f"Expected {expected_type}, got {token[0]}")
+        kind = self.kinds[self.current]
+        if expected_kind is not None and kind != expected_kind:
+            raise SyntaxError(f"Expected {TOKEN_KINDS[expected_kind]}, got {TOKEN_KINDS[kind]}")
         self.current += 1
-        return token
+        return kind
+
+    def consume_name(self):
+        self.consume(IDENTIFIER)
+        return self.names[self.values[self.current - 1]]
 
-    def match(self, *types):
-        if self.current < len(self.tokens) and self.tokens[self.current][0] in types:
+    def match(self, *kinds):
+        if self.current < self.length and self.kinds[self.current] in kinds:
             self.current += 1
             return True
         return False
 
     def parse(self):
         statements = []
-        while self.peek()[0] != 'EOF':
-            if self.peek()[0] == 'EOL':
-                self.consume('EOL')
+        while self.peek() != EOF:
+            if self.peek() == EOL:
+                self.consume(EOL)
                 continue
             statements.append(self.parse_statement())
         return statements
 
     def parse_block(self):
-        self.consume('INDENT')
+        self.consume(INDENT)
         block = []
         while True:
-            token = self.peek()[0]
-            if token == 'DEDENT':
+            kind = self.peek()
+            if kind == DEDENT:
                 break
-            if token == 'EOL':
-                self.consume('EOL')
+            if kind == EOL:
+                self.consume(EOL)
                 continue
             block.append(self.parse_statement())
-        self.consume('DEDENT')
+        self.consume(DEDENT)
         return block
 
     def parse_statement(self):
-        if self.match('LET'):
-            name = self.consume('IDENTIFIER')[1]
-            self.consume('=')
+        if self.match(LET):
+            name = self.consume_name()
+            self.consume(EQUALS)
             expr = self.parse_expression()
-            self.consume('EOL')
+            self.consume(EOL)
             return ('ASSIGN', name, expr)
 
-        if self.peek()[0] == 'IDENTIFIER':
-            if self.current + 1 < len(self.tokens) and self.tokens[self.current + 1][0] == '=':
-                name = self.consume('IDENTIFIER')[1]
-                self.consume('=')
+        if self.peek() == IDENTIFIER:
+            if self.current + 1 < self.length and self.kinds[self.current + 1] == EQUALS:
+                name = self.consume_name()
+                self.consume(EQUALS)
                 expr = self.parse_expression()
-                self.consume('EOL')
+                self.consume(EOL)
                 return ('ASSIGN', name, expr)
 
-        if self.match('PRINT'):
+        if self.match(PRINT):
             expr = self.parse_expression()
-            self.consume('EOL')
+            self.consume(EOL)
             return ('PRINT', expr)
 
-        if self.match('IF'):
+        if self.match(IF):
             condition = self.parse_expression()
-            self.consume('EOL')
+            self.consume(EOL)
             true_branch = self.parse_block()
             false_branch = []
-            if self.match('ELSE'):
-                self.consume('EOL')
+            if self.match(ELSE):
+                self.consume(EOL)
                 false_branch = self.parse_block()
             return ('IF', condition, true_branch, false_branch)
 
-        if self.match('WHILE'):
+        if self.match(WHILE):
             condition = self.parse_expression()
-            self.consume('EOL')
+            self.consume(EOL)
             body = self.parse_block()
             return ('WHILE', condition, body)
 
-        if self.match('FOR'):
-            var = self.consume('IDENTIFIER')[1]
-            self.consume('=')
+        if self.match(FOR):
+            var = self.consume_name()
+            self.consume(EQUALS)
             start = self.parse_expression()
-            self.consume('TO')
+            self.consume(TO)
             end = self.parse_expression()
-            self.consume('EOL')
+            self.consume(EOL)
             body = self.parse_block()
             return ('FOR', var, start, end, body)
 
-        raise SyntaxError(f"Unknown statement at token {self.peek()}")
+        token = self.tokens[self.current] if self.current < self.length else ('EOF', None)
+        raise SyntaxError(f"Unknown statement at token {token}")
 
 
     def parse_expression(self):
@@ -148,24 +260,24 @@ class Parser:
 
     def parse_comparison(self):
         expr = self.parse_term()
-        while self.peek()[0] in ('>', '<'):
-            op = self.consume()[0]
+        while self.peek() in (GREATER, LESS):
+            op = TOKEN_KINDS[self.consume()]
             right = self.parse_term()
             expr = (op, expr, right)
         return expr
 
     def parse_term(self):
         expr = self.parse_factor()
-        while self.peek()[0] in ('+', '-'):
-            op = self.consume()[0]
+        while self.peek() in (PLUS, MINUS):
+            op = TOKEN_KINDS[self.consume()]
             right = self.parse_factor()
             expr = (op, expr, right)
         return expr
 
     def parse_factor(self):
         expr = self.parse_unary()
-        while self.peek()[0] in ('*', '/', '%'):
-            op = self.consume()[0]
+        while self.peek() in (STAR, SLASH, PERCENT):
+            op = TOKEN_KINDS[self.consume()]
             right = self.parse_unary()
             expr = (op, expr, right)
         return expr
@@ -174,10 +286,12 @@ class Parser:
         return self.parse_primary()
 
     def parse_primary(self):
-        token = self.consume()
-        if token[0] in ('NUMBER', 'IDENTIFIER'):
-            return token
-        raise SyntaxError(f"Expected number or identifier, got {token[0]}")
+        kind = self.consume()
+        if kind == IDENTIFIER:
+            return ('IDENTIFIER', self.names[self.values[self.current - 1]])
+        if kind == NUMBER:
+            return ('NUMBER', self.numbers[self.values[self.current - 1]])
+        raise SyntaxError(f"Expected number or identifier, got {TOKEN_KINDS[kind]}")
     
 class Interpreter:
     def __init__(self, statements):
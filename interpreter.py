@@ -7,14 +7,17 @@ from io import StringIO
 import contextlib
 
 from compiler import Lexer,Parser,Interpreter
+from metrics import Instrumentation, count_nodes
+from parallel import LoopParallelizer
 class Interpreter:
-    def __init__(self, statements, output_widget=None):
+    def __init__(self, statements, output_widget=None, parallel=False, workers=None):
         self.statements = statements
         self.env = {}
         self.output_widget = output_widget
+        self.parallelizer = LoopParallelizer(workers) if parallel else None
 
     def print_output(self, value):
-        if self.output_widget:
+        if self.output_widget is not None:
             self.output_widget.append(str(value))
         else:
             print(value)
@@ -43,7 +46,11 @@ class Interpreter:
             return expr
 
     def exec(self):
-        self.execute_statements(self.statements)
+        try:
+            self.execute_statements(self.statements)
+        finally:
+            if self.parallelizer:
+                self.parallelizer.shutdown()
 
     def execute_statements(self, statements):
         for stmt in statements:
@@ -70,18 +77,92 @@ class Interpreter:
             _, var, start_expr, end_expr, body = stmt
             start = self.eval_expr(start_expr)
             end = self.eval_expr(end_expr)
+            if self.parallelizer and self.parallelizer.run(self, stmt, start, end):
+                return
             for i in range(start, end + 1):
                 self.env[var] = i
                 self.execute_statements(body)
 
 
-def run_compiler(source_code, output_widget=None):
-    lexer = Lexer(source_code)
-    tokens = lexer.tokenize()
-    parser = Parser(tokens)
-    ast = parser.parse()
-    interpreter = Interpreter(ast, output_widget)
-    interpreter.exec()
+def run_compiler(source_code, output_widget=None, event_log=None, trace_memory=False, parallel=False, workers=None):
+    metrics = Instrumentation(event_log=event_log, trace_memory=trace_memory)
+
+    with metrics.phase('lex', 'tokens') as phase:
+        lexer = Lexer(source_code)
+        tokens = lexer.tokenize_compact()
+        phase.count = len(tokens)
+
+    with metrics.phase('parse', 'nodes') as phase:
+        parser = Parser(tokens)
+        ast = parser.parse()
+        phase.count = count_nodes(ast)
+
+    with metrics.phase('execute'):
+        interpreter = Interpreter(ast, output_widget, parallel, workers)
+        interpreter.exec()
+
+    return metrics.result
+
+
+class CompilerSession:
+    """Re-runs an edited program from the first top-level statement that changed.
+
+    After each top-level statement the env and the number of output lines are
+    checkpointed. A run compares the new AST with the previous one and
+    restores the checkpoint just before the first differing statement, so an
+    edit inside a loop that already ran re-executes that whole loop from the
+    state it started with.
+    """
+
+    def __init__(self):
+        self.ast = []
+        self.checkpoints = []
+        self.output = []
+        self.resumed_from = 0
+
+    def first_change(self, ast):
+        limit = min(len(ast), len(self.ast), len(self.checkpoints))
+        index = 0
+        while index < limit and ast[index] == self.ast[index]:
+            index += 1
+        return index
+
+    def run(self, source_code, event_log=None, trace_memory=False):
+        metrics = Instrumentation(event_log=event_log, trace_memory=trace_memory)
+
+        with metrics.phase('lex', 'tokens') as phase:
+            tokens = Lexer(source_code).tokenize_compact()
+            phase.count = len(tokens)
+
+        with metrics.phase('parse', 'nodes') as phase:
+            ast = Parser(tokens).parse()
+            phase.count = count_nodes(ast)
+
+        with metrics.phase('execute', 'statements') as phase:
+            resume = self.first_change(ast)
+            del self.checkpoints[resume:]
+            if resume:
+                env, output_length = self.checkpoints[-1]
+            else:
+                env, output_length = {}, 0
+            del self.output[output_length:]
+
+            self.ast = ast
+            self.resumed_from = resume
+            interpreter = Interpreter(ast, self.output)
+            interpreter.env = dict(env)
+            phase.count = 0
+            for stmt in ast[resume:]:
+                interpreter.execute(stmt)
+                phase.count += 1
+                # Checkpoints are never mutated, so a PRINT can share the previous env snapshot.
+                if stmt[0] == 'PRINT' and self.checkpoints:
+                    snapshot = self.checkpoints[-1][0]
+                else:
+                    snapshot = dict(interpreter.env)
+                self.checkpoints.append((snapshot, len(self.output)))
+
+        return metrics.result
 
 class CompilerGUI(QWidget):
     def __init__(self):
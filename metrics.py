@@ -0,0 +1,117 @@
+import json
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+
+def count_nodes(node):
+    """Count AST nodes (statements and expressions) produced by the Parser."""
+    if isinstance(node, list):
+        return sum(count_nodes(child) for child in node)
+    if isinstance(node, tuple):
+        return 1 + sum(count_nodes(child) for child in node[1:] if isinstance(child, (tuple, list)))
+    return 0
+
+
+class PhaseMetrics:
+    def __init__(self, name, unit=None):
+        self.name = name
+        self.unit = unit
+        self.count = None
+        self.wall_time = 0.0
+        self.peak_memory = None
+        self.error = None
+
+    def to_dict(self):
+        return {
+            'phase': self.name,
+            'count': self.count,
+            'unit': self.unit,
+            'wall_time': self.wall_time,
+            'peak_memory': self.peak_memory,
+            'error': self.error,
+        }
+
+    def __str__(self):
+        text = f"{self.name} {self.wall_time * 1000:.2f} ms"
+        if self.count is not None:
+            text += f" ({self.count} {self.unit})"
+        if self.peak_memory is not None:
+            text += f" peak {self.peak_memory / 1024:.1f} KiB"
+        return text
+
+
+class CompileResult:
+    def __init__(self, code=None):
+        self.code = code
+        self.phases = []
+
+    def phase(self, name):
+        for record in self.phases:
+            if record.name == name:
+                return record
+        return None
+
+    @property
+    def total_time(self):
+        return sum(record.wall_time for record in self.phases)
+
+    def to_dict(self):
+        return {
+            'total_time': self.total_time,
+            'phases': [record.to_dict() for record in self.phases],
+        }
+
+    def summary(self):
+        return ' | '.join(str(record) for record in self.phases)
+
+
+class Instrumentation:
+    """Records per-phase timings into a CompileResult.
+
+    event_log may be a path or a writable file object; each finished phase is
+    appended to it as one JSON line. Peak allocation is only measured when
+    trace_memory is set, since tracemalloc slows execution down noticeably.
+    """
+
+    def __init__(self, result=None, event_log=None, trace_memory=False):
+        self.result = result if result is not None else CompileResult()
+        self.event_log = event_log
+        self.trace_memory = trace_memory
+
+    @contextmanager
+    def phase(self, name, unit=None):
+        record = PhaseMetrics(name, unit)
+        started_tracing = False
+        if self.trace_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                started_tracing = True
+            tracemalloc.reset_peak()
+            baseline = tracemalloc.get_traced_memory()[0]
+
+        start = time.perf_counter()
+        try:
+            yield record
+        except Exception as e:
+            record.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            record.wall_time = time.perf_counter() - start
+            if self.trace_memory:
+                record.peak_memory = max(tracemalloc.get_traced_memory()[1] - baseline, 0)
+                if started_tracing:
+                    tracemalloc.stop()
+            self.result.phases.append(record)
+            self.emit(record)
+
+    def emit(self, record):
+        if self.event_log is None:
+            return
+        event = dict(record.to_dict(), timestamp=time.time())
+        line = json.dumps(event) + '\n'
+        if hasattr(self.event_log, 'write'):
+            self.event_log.write(line)
+        else:
+            with open(self.event_log, 'a', encoding='utf-8') as log:
+                log.write(line)
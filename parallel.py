@@ -0,0 +1,203 @@
+import contextlib
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from compiler import Interpreter
+
+MIN_PARALLEL_ITERATIONS = 2000
+REDUCTION_IDENTITY = {'+': 0, '*': 1}
+
+
+def expr_names(expr):
+    if expr[0] == 'IDENTIFIER':
+        return {expr[1]}
+    if expr[0] == 'NUMBER':
+        return set()
+    return expr_names(expr[1]) | expr_names(expr[2])
+
+
+def walk(statements):
+    for stmt in statements:
+        yield stmt
+        if stmt[0] == 'IF':
+            yield from walk(stmt[2])
+            yield from walk(stmt[3])
+        elif stmt[0] == 'WHILE':
+            yield from walk(stmt[2])
+        elif stmt[0] == 'FOR':
+            yield from walk(stmt[4])
+
+
+def stmt_reads(stmt):
+    if stmt[0] in ('ASSIGN', 'PRINT'):
+        return expr_names(stmt[-1])
+    if stmt[0] in ('IF', 'WHILE'):
+        return expr_names(stmt[1])
+    return expr_names(stmt[2]) | expr_names(stmt[3])
+
+
+def stmt_writes(stmt):
+    if stmt[0] in ('ASSIGN', 'FOR'):
+        return {stmt[1]}
+    return set()
+
+
+def find_reductions(body, loop_var):
+    """Return {name: op} for variables only ever updated as `name = name op expr`."""
+    candidates = {}
+    for stmt in walk(body):
+        if stmt[0] != 'ASSIGN':
+            continue
+        _, name, expr = stmt
+        if expr[0] in REDUCTION_IDENTITY and expr[1] == ('IDENTIFIER', name) and name not in expr_names(expr[2]):
+            candidates.setdefault(name, set()).add(expr[0])
+
+    reductions = {}
+    for name, ops in candidates.items():
+        if name == loop_var or len(ops) != 1:
+            continue
+        op = ops.pop()
+        for stmt in walk(body):
+            is_update = (stmt[0] == 'ASSIGN' and stmt[1] == name and stmt[2][0] == op
+                         and stmt[2][1] == ('IDENTIFIER', name) and name not in expr_names(stmt[2][2]))
+            if not is_update and (name in stmt_reads(stmt) or name in stmt_writes(stmt)):
+                break
+        else:
+            reductions[name] = op
+    return reductions
+
+
+def scan(statements, defined, exposed, written, reductions):
+    # defined holds the names certainly assigned earlier in the current
+    # iteration; a read of anything else sees the previous iteration's value.
+    for stmt in statements:
+        if stmt[0] == 'ASSIGN':
+            _, name, expr = stmt
+            if name in reductions:
+                # The accumulator itself is handled by the reduction, but its
+                # operand can still read a value carried from the last iteration.
+                exposed |= expr_names(expr[2]) - defined
+                continue
+            exposed |= expr_names(expr) - defined
+            defined.add(name)
+            written.add(name)
+        elif stmt[0] == 'PRINT':
+            exposed |= expr_names(stmt[1]) - defined
+        elif stmt[0] == 'IF':
+            _, cond, true_branch, false_branch = stmt
+            exposed |= expr_names(cond) - defined
+            true_defined = set(defined)
+            false_defined = set(defined)
+            scan(true_branch, true_defined, exposed, written, reductions)
+            scan(false_branch, false_defined, exposed, written, reductions)
+            defined |= true_defined & false_defined
+        elif stmt[0] == 'WHILE':
+            _, cond, body = stmt
+            exposed |= expr_names(cond) - defined
+            scan(body, set(defined), exposed, written, reductions)
+        elif stmt[0] == 'FOR':
+            _, var, start_expr, end_expr, body = stmt
+            exposed |= (expr_names(start_expr) | expr_names(end_expr)) - defined
+            written.add(var)
+            scan(body, set(defined) | {var}, exposed, written, reductions)
+
+
+class LoopPlan:
+    def __init__(self, var, private, reductions):
+        self.var = var
+        self.private = private
+        self.reductions = reductions
+
+
+def analyze_for_loop(stmt):
+    """Return a LoopPlan if the iterations of a FOR loop carry no data dependencies, else None."""
+    _, var, _, _, body = stmt
+    reductions = find_reductions(body, var)
+    exposed, written = set(), {var}
+    scan(body, {var}, exposed, written, reductions)
+    if exposed & written:
+        return None
+    return LoopPlan(var, written, reductions)
+
+
+def run_chunk(body, var, first, last, env, reductions):
+    for name, op in reductions.items():
+        env[name] = REDUCTION_IDENTITY[op]
+    interpreter = Interpreter(body)
+    interpreter.env = env
+    buffer = io.StringIO()
+    error = None
+    with contextlib.redirect_stdout(buffer):
+        try:
+            for i in range(first, last + 1):
+                env[var] = i
+                interpreter.execute_statements(body)
+        except Exception as e:
+            error = e
+    partials = {name: env[name] for name in reductions}
+    updates = {name: value for name, value in env.items() if name not in reductions}
+    return buffer.getvalue(), updates, partials, error
+
+
+class LoopParallelizer:
+    """Runs dependence-free FOR loops of an Interpreter across a process pool.
+
+    Each worker gets a contiguous slice of the iteration range. Printed
+    output is replayed in iteration order, private variables take the value
+    from the last slice that assigned them and reductions are folded in order,
+    so the result matches sequential execution.
+    """
+
+    def __init__(self, workers=None, min_iterations=MIN_PARALLEL_ITERATIONS):
+        self.workers = workers or os.cpu_count() or 1
+        self.min_iterations = min_iterations
+        self.plans = {}
+        self.pool = None
+
+    def plan(self, stmt):
+        key = id(stmt)
+        if key not in self.plans:
+            self.plans[key] = (stmt, analyze_for_loop(stmt))
+        return self.plans[key][1]
+
+    def run(self, interpreter, stmt, start, end):
+        if self.workers < 2 or end - start + 1 < self.min_iterations:
+            return False
+        plan = self.plan(stmt)
+        if plan is None or any(name not in interpreter.env for name in plan.reductions):
+            return False
+
+        if self.pool is None:
+            self.pool = ProcessPoolExecutor(max_workers=self.workers)
+
+        env = interpreter.env
+        shared = {name: value for name, value in env.items()
+                  if name not in plan.private and name not in plan.reductions}
+        total = end - start + 1
+        size, extra = divmod(total, self.workers)
+        futures = []
+        first = start
+        for worker in range(self.workers):
+            last = first + size - 1 + (1 if worker < extra else 0)
+            if last >= first:
+                futures.append(self.pool.submit(run_chunk, stmt[4], plan.var, first, last, dict(shared), plan.reductions))
+            first = last + 1
+
+        for future in futures:
+            output, updates, partials, error = future.result()
+            for line in output.splitlines():
+                interpreter.print_output(line)
+            for name, value in updates.items():
+                if name in plan.private:
+                    env[name] = value
+            for name, value in partials.items():
+                env[name] = env[name] + value if plan.reductions[name] == '+' else env[name] * value
+            if error is not None:
+                raise error
+        return True
+
+    def shutdown(self):
+        if self.pool is not None:
+            self.pool.shutdown()
+            self.pool = None
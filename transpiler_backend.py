@@ -1,3 +1,14 @@
+import keyword
+import py_compile
+import re
+
+from compiler import Lexer, Parser
+from metrics import Instrumentation
+
+INT32_MIN = -2 ** 31
+INT32_MAX = 2 ** 31 - 1
+UNBOUNDED = (float('-inf'), float('inf'))
+
 def indent(level):
     return ' ' * (4 * level)
 
@@ -5,9 +16,183 @@ def get_indent(line):
     """Return indentation level (4 spaces per indent)."""
     return (len(line) - len(line.lstrip(' '))) // 4
 
-def transpile_to_cpp(source_code):
+def fits_int32(value_range):
+    return INT32_MIN <= value_range[0] and value_range[1] <= INT32_MAX
+
+def identifiers(expr):
+    if expr[0] == 'IDENTIFIER':
+        return {expr[1]}
+    if expr[0] == 'NUMBER':
+        return set()
+    return identifiers(expr[1]) | identifiers(expr[2])
+
+def multiply(a, b):
+    return 0 if a == 0 or b == 0 else a * b
+
+def join_ranges(a, b):
+    if a is None:
+        return b
+    if b is None:
+        return a
+    return (min(a[0], b[0]), max(a[1], b[1]))
+
+def expr_range(expr, ranges, wide, overflow=None):
+    """Return the (lo, hi) interval of expr, marking operands of any 32-bit overflow as wide.
+
+    If overflow is a list, every overflowing subexpression is appended to it.
+    """
+    if expr[0] == 'NUMBER':
+        return (expr[1], expr[1])
+    if expr[0] == 'IDENTIFIER':
+        return ranges.get(expr[1], UNBOUNDED)
+
+    op, left, right = expr
+    lo1, hi1 = expr_range(left, ranges, wide, overflow)
+    lo2, hi2 = expr_range(right, ranges, wide, overflow)
+    if op in ('>', '<'):
+        return (0, 1)
+    if op == '+':
+        result = (lo1 + lo2, hi1 + hi2)
+    elif op == '-':
+        result = (lo1 - hi2, hi1 - lo2)
+    elif op == '*':
+        products = [multiply(lo1, lo2), multiply(lo1, hi2), multiply(hi1, lo2), multiply(hi1, hi2)]
+        result = (min(products), max(products))
+    elif op == '/':
+        bound = max(abs(lo1), abs(hi1))
+        result = (-bound, bound)
+    else:
+        bound = max(abs(lo2), abs(hi2))
+        result = (-bound, bound)
+
+    if not fits_int32(result):
+        wide.update(identifiers(expr))
+        if overflow is not None:
+            overflow.append(expr)
+    return result
+
+def analyze_ranges(statements, ranges, wide):
+    for stmt in statements:
+        if stmt[0] == 'ASSIGN':
+            _, name, expr = stmt
+            overflow = []
+            ranges[name] = expr_range(expr, ranges, wide, overflow)
+            if overflow or not fits_int32(ranges[name]):
+                wide.add(name)
+        elif stmt[0] == 'PRINT':
+            expr_range(stmt[1], ranges, wide)
+        elif stmt[0] == 'IF':
+            _, cond, true_branch, false_branch = stmt
+            expr_range(cond, ranges, wide)
+            true_ranges = dict(ranges)
+            false_ranges = dict(ranges)
+            analyze_ranges(true_branch, true_ranges, wide)
+            analyze_ranges(false_branch, false_ranges, wide)
+            for name in set(true_ranges) | set(false_ranges):
+                ranges[name] = join_ranges(true_ranges.get(name), false_ranges.get(name))
+        elif stmt[0] == 'WHILE':
+            _, cond, body = stmt
+            analyze_loop(body, ranges, wide, lambda: expr_range(cond, ranges, wide))
+        elif stmt[0] == 'FOR':
+            _, var, start_expr, end_expr, body = stmt
+            start = expr_range(start_expr, ranges, wide)
+            end = expr_range(end_expr, ranges, wide)
+            loop_range = (start[0], end[1])
+            if not fits_int32(loop_range):
+                wide.add(var)
+
+            def enter():
+                ranges[var] = join_ranges(ranges.get(var), loop_range)
+
+            analyze_loop(body, ranges, wide, enter)
+
+def analyze_loop(body, ranges, wide, enter):
+    # Any variable that still changes after a pass over the body is widened
+    # to infinity in the direction it grew, so the fixpoint is reached quickly.
+    while True:
+        enter()
+        body_ranges = dict(ranges)
+        analyze_ranges(body, body_ranges, wide)
+        changed = False
+        for name, (lo, hi) in body_ranges.items():
+            old = ranges.get(name)
+            if old is None:
+                ranges[name] = (lo, hi)
+                changed = True
+            elif (lo, hi) != old and join_ranges(old, (lo, hi)) != old:
+                new_lo = old[0] if lo >= old[0] else float('-inf')
+                new_hi = old[1] if hi <= old[1] else float('inf')
+                ranges[name] = (new_lo, new_hi)
+                changed = True
+        if not changed:
+            break
+    for name, value_range in ranges.items():
+        if not fits_int32(value_range):
+            wide.add(name)
+
+def assignments(statements):
+    """Yield (target, source expressions) for every assignment, including FOR loop variables."""
+    for stmt in statements:
+        if stmt[0] == 'ASSIGN':
+            yield stmt[1], (stmt[2],)
+        elif stmt[0] == 'IF':
+            yield from assignments(stmt[2])
+            yield from assignments(stmt[3])
+        elif stmt[0] == 'WHILE':
+            yield from assignments(stmt[2])
+        elif stmt[0] == 'FOR':
+            yield stmt[1], (stmt[2], stmt[3])
+            yield from assignments(stmt[4])
+
+def propagate_wide(statements, wide):
+    # A narrow variable assigned from a wide one would need a narrowing
+    # conversion (a compile error in Java), so the target becomes wide too.
+    edges = list(assignments(statements))
+    changed = True
+    while changed:
+        changed = False
+        for target, exprs in edges:
+            if target not in wide and any(identifiers(expr) & wide for expr in exprs):
+                wide.add(target)
+                changed = True
+
+def wide_variables(source_code):
+    """Return the variables that need a 64-bit type, or None if the program can't be analyzed."""
+    try:
+        ast = Parser(Lexer(source_code).tokenize_compact()).parse()
+    except (SyntaxError, ValueError):
+        return None
+    wide = set()
+    analyze_ranges(ast, {}, wide)
+    propagate_wide(ast, wide)
+    return wide
+
+def widen_literals(expr, suffix):
+    """Add a 64-bit suffix to the integer literals of expr so constant arithmetic can't overflow int."""
+    return re.sub(r'\b(\d+)\b', rf'\g<1>{suffix}', expr)
+
+def wide_expr(expr, var, wide, suffix):
+    if wide is None or var in wide:
+        return widen_literals(expr, suffix)
+    return expr
+
+def var_type(var, wide, wide_type):
+    if wide is None or var in wide:
+        return wide_type
+    return 'int'
+
+def transpile_to_cpp(source_code, optimize=False):
     lines = source_code.strip('\n').splitlines()
     output = ['#include <iostream>', 'using namespace std;', 'int main() {']
+    wide = set()
+    line_end = 'endl'
+    print_suffix = ''
+    if optimize:
+        output.append(f"{indent(1)}ios::sync_with_stdio(false);")
+        output.append(f"{indent(1)}cin.tie(nullptr);")
+        wide = wide_variables(source_code)
+        line_end = "'\\n'"
+        print_suffix = 'LL'
     indent_level = 1
     block_stack = []
     prev_indent = 0
@@ -26,9 +211,9 @@ def transpile_to_cpp(source_code):
 
         if line.startswith("let "):
             var, val = map(str.strip, line[4:].split('=', 1))
-            output.append(f"{indent(indent_level)}int {var} = {val};")
+            output.append(f"{indent(indent_level)}{var_type(var, wide, 'long long')} {var} = {wide_expr(val, var, wide, 'LL')};")
         elif line.startswith("print "):
-            output.append(f"{indent(indent_level)}cout << {line[6:].strip()} << endl;")
+            output.append(f"{indent(indent_level)}cout << {widen_literals(line[6:].strip(), print_suffix)} << {line_end};")
         elif line.startswith("if "):
             output.append(f"{indent(indent_level)}if ({line[3:].strip()}) {{")
             block_stack.append("if")
@@ -43,7 +228,7 @@ def transpile_to_cpp(source_code):
             parts = line[4:].split('=')
             var = parts[0].strip()
             start, end = map(str.strip, parts[1].replace("to", ",").split(','))
-            output.append(f"{indent(indent_level)}for (int {var} = {start}; {var} < {end}; {var}++) {{")
+            output.append(f"{indent(indent_level)}for ({var_type(var, wide, 'long long')} {var} = {wide_expr(start, var, wide, 'LL')}; {var} < {wide_expr(end, var, wide, 'LL')}; {var}++) {{")
             block_stack.append("for")
             indent_level += 1
             prev_indent = current_indent + 1
@@ -65,9 +250,18 @@ def transpile_to_cpp(source_code):
     output.append("}")
     return '\n'.join(output)
 
-def transpile_to_java(source_code):
+def transpile_to_java(source_code, optimize=False):
     lines = source_code.strip('\n').splitlines()
     output = ['public class Main {', '    public static void main(String[] args) {']
+    wide = set()
+    println = 'System.out.println'
+    print_suffix = ''
+    if optimize:
+        output.insert(0, 'import java.io.*;\n')
+        output.append(f"{indent(2)}PrintWriter out$ = new PrintWriter(new BufferedWriter(new OutputStreamWriter(System.out), 1 << 16));")
+        wide = wide_variables(source_code)
+        println = 'out$.println'
+        print_suffix = 'L'
     indent_level = 2
     block_stack = []
     prev_indent = 0
@@ -86,9 +280,9 @@ def transpile_to_java(source_code):
 
         if line.startswith("let "):
             var, val = map(str.strip, line[4:].split('=', 1))
-            output.append(f"{indent(indent_level)}int {var} = {val};")
+            output.append(f"{indent(indent_level)}{var_type(var, wide, 'long')} {var} = {wide_expr(val, var, wide, 'L')};")
         elif line.startswith("print "):
-            output.append(f"{indent(indent_level)}System.out.println({line[6:].strip()});")
+            output.append(f"{indent(indent_level)}{println}({widen_literals(line[6:].strip(), print_suffix)});")
         elif line.startswith("if "):
             output.append(f"{indent(indent_level)}if ({line[3:].strip()}) {{")
             block_stack.append("if")
@@ -103,7 +297,7 @@ def transpile_to_java(source_code):
             parts = line[4:].split('=')
             var = parts[0].strip()
             start, end = map(str.strip, parts[1].replace("to", ",").split(','))
-            output.append(f"{indent(indent_level)}for (int {var} = {start}; {var} < {end}; {var}++) {{")
+            output.append(f"{indent(indent_level)}for ({var_type(var, wide, 'long')} {var} = {wide_expr(start, var, wide, 'L')}; {var} < {wide_expr(end, var, wide, 'L')}; {var}++) {{")
             block_stack.append("for")
             indent_level += 1
             prev_indent = current_indent + 1
@@ -121,13 +315,117 @@ def transpile_to_java(source_code):
         block_stack.pop()
         output.append(f"{indent(indent_level)}}}")
 
+    if optimize:
+        output.append(f"{indent(2)}out$.flush();")
     output.append('    }')
     output.append('}')
     return '\n'.join(output)
 
 
 
-def transpile_to_python(source_code):
+PYTHON_PRELUDE = [
+    'def _div(a, b):',
+    '    return a // b if b != 0 else 0',
+    '',
+    'def _mod(a, b):',
+    '    return a % b if b != 0 else 0',
+    '',
+]
+PYTHON_RESERVED = {'_div', '_mod', '_print', '_range', 'main'}
+
+def python_names(statements):
+    """Map DSL variable names to Python locals that can't clash with keywords or helpers."""
+    used = set()
+    for stmt in statements:
+        if stmt[0] == 'ASSIGN':
+            used.add(stmt[1])
+            used |= identifiers(stmt[2])
+        elif stmt[0] == 'PRINT':
+            used |= identifiers(stmt[1])
+        elif stmt[0] == 'IF':
+            used |= identifiers(stmt[1])
+            used |= set(python_names(stmt[2])) | set(python_names(stmt[3]))
+        elif stmt[0] == 'WHILE':
+            used |= identifiers(stmt[1])
+            used |= set(python_names(stmt[2]))
+        elif stmt[0] == 'FOR':
+            used.add(stmt[1])
+            used |= identifiers(stmt[2]) | identifiers(stmt[3])
+            used |= set(python_names(stmt[4]))
+
+    names = {}
+    for name in sorted(used):
+        mangled = name
+        while keyword.iskeyword(mangled) or mangled in PYTHON_RESERVED or (mangled != name and mangled in used):
+            mangled += '_'
+        names[name] = mangled
+    return names
+
+def python_expr(expr, names):
+    if expr[0] == 'NUMBER':
+        return str(expr[1])
+    if expr[0] == 'IDENTIFIER':
+        return names[expr[1]]
+    op, left, right = expr
+    if op == '/':
+        return f"_div({python_expr(left, names)}, {python_expr(right, names)})"
+    if op == '%':
+        return f"_mod({python_expr(left, names)}, {python_expr(right, names)})"
+    return f"({python_expr(left, names)} {op} {python_expr(right, names)})"
+
+def emit_python(statements, level, names, output):
+    for stmt in statements:
+        if stmt[0] == 'ASSIGN':
+            output.append(f"{indent(level)}{names[stmt[1]]} = {python_expr(stmt[2], names)}")
+        elif stmt[0] == 'PRINT':
+            output.append(f"{indent(level)}_print({python_expr(stmt[1], names)})")
+        elif stmt[0] == 'IF':
+            _, cond, true_branch, false_branch = stmt
+            output.append(f"{indent(level)}if {python_expr(cond, names)}:")
+            emit_python(true_branch, level + 1, names, output)
+            if false_branch:
+                output.append(f"{indent(level)}else:")
+                emit_python(false_branch, level + 1, names, output)
+        elif stmt[0] == 'WHILE':
+            _, cond, body = stmt
+            output.append(f"{indent(level)}while {python_expr(cond, names)}:")
+            emit_python(body, level + 1, names, output)
+        elif stmt[0] == 'FOR':
+            _, var, start, end, body = stmt
+            output.append(f"{indent(level)}for {names[var]} in _range({python_expr(start, names)}, {python_expr(end, names)} + 1):")
+            emit_python(body, level + 1, names, output)
+
+def transpile_to_python_optimized(source_code):
+    # Everything lives in main() so variables are fast locals; the helpers and
+    # builtins it calls are bound as default arguments for the same reason.
+    ast = Parser(Lexer(source_code).tokenize_compact()).parse()
+    names = python_names(ast)
+    output = list(PYTHON_PRELUDE)
+    output.append('def main(_div=_div, _mod=_mod, _print=print, _range=range):')
+    body_start = len(output)
+    emit_python(ast, 1, names, output)
+    if len(output) == body_start:
+        output.append(f"{indent(1)}pass")
+    output.append('')
+    output.append("if __name__ == '__main__':")
+    output.append(f"{indent(1)}main()")
+    return '\n'.join(output)
+
+def write_python_module(source_code, path, optimize=True, cache=True):
+    """Write the transpiled program to path and, if cache is set, its bytecode to __pycache__.
+
+    The .pyc goes where the import system looks for it, so importing the
+    module and calling main() skips compilation.
+    """
+    with open(path, 'w', encoding='utf-8') as file:
+        file.write(transpile_to_python(source_code, optimize) + '\n')
+    if cache:
+        return py_compile.compile(path, doraise=True)
+    return None
+
+def transpile_to_python(source_code, optimize=False):
+    if optimize:
+        return transpile_to_python_optimized(source_code)
     lines = source_code.strip('\n').splitlines()
     output = []
     indent_level = 0
@@ -177,9 +475,13 @@ def transpile_to_python(source_code):
 
     return '\n'.join(output)
 
-def transpile_to_c(source_code):
+def transpile_to_c(source_code, optimize=False):
     lines = source_code.strip('\n').splitlines()
     output = ['#include <stdio.h>', '', 'int main() {']
+    wide = set()
+    if optimize:
+        output.append(f"{indent(1)}setvbuf(stdout, NULL, _IOFBF, 1 << 16);")
+        wide = wide_variables(source_code)
     indent_level = 1
     block_stack = []
     prev_indent = 0
@@ -198,9 +500,12 @@ def transpile_to_c(source_code):
 
         if line.startswith("let "):
             var, val = map(str.strip, line[4:].split('=', 1))
-            output.append(f"{indent(indent_level)}int {var} = {val};")
+            output.append(f"{indent(indent_level)}{var_type(var, wide, 'long long')} {var} = {wide_expr(val, var, wide, 'LL')};")
         elif line.startswith("print "):
-            output.append(f"{indent(indent_level)}printf(\"%d\\n\", {line[6:].strip()});")
+            if optimize:
+                output.append(f"{indent(indent_level)}printf(\"%lld\\n\", (long long)({widen_literals(line[6:].strip(), 'LL')}));")
+            else:
+                output.append(f"{indent(indent_level)}printf(\"%d\\n\", {line[6:].strip()});")
         elif line.startswith("if "):
             output.append(f"{indent(indent_level)}if ({line[3:].strip()}) {{")
             block_stack.append("if")
@@ -215,7 +520,7 @@ def transpile_to_c(source_code):
             parts = line[4:].split('=')
             var = parts[0].strip()
             start, end = map(str.strip, parts[1].replace("to", ",").split(','))
-            output.append(f"{indent(indent_level)}for (int {var} = {start}; {var} < {end}; {var}++) {{")
+            output.append(f"{indent(indent_level)}for ({var_type(var, wide, 'long long')} {var} = {wide_expr(start, var, wide, 'LL')}; {var} < {wide_expr(end, var, wide, 'LL')}; {var}++) {{")
             block_stack.append("for")
             indent_level += 1
             prev_indent = current_indent + 1
@@ -237,3 +542,20 @@ def transpile_to_c(source_code):
     output.append("}")
     return '\n'.join(output)
 
+
+TRANSPILERS = {
+    'python': transpile_to_python,
+    'c': transpile_to_c,
+    'cpp': transpile_to_cpp,
+    'java': transpile_to_java,
+}
+
+def transpile(target, source_code, event_log=None, trace_memory=False, **options):
+    if target not in TRANSPILERS:
+        raise ValueError(f"Unknown transpile target: {target}")
+    metrics = Instrumentation(event_log=event_log, trace_memory=trace_memory)
+    with metrics.phase(f'transpile:{target}', 'lines') as phase:
+        code = TRANSPILERS[target](source_code, **options)
+        phase.count = code.count('\n') + 1
+    metrics.result.code = code
+    return metrics.result